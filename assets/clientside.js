@@ -0,0 +1,252 @@
+// Clientside renderers for the analysis results.
+// The server only ships the compact result object; the cards are built here.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    ui: {
+        renderAnalysis: function(data) {
+            if (!data) {
+                return window.dash_clientside.no_update;
+            }
+
+            function html(type, props, children) {
+                props = Object.assign({}, props || {});
+                if (children !== undefined) {
+                    props.children = children;
+                }
+                return {namespace: "dash_html_components", type: type, props: props};
+            }
+
+            function dbc(type, props, children) {
+                props = Object.assign({}, props || {});
+                if (children !== undefined) {
+                    props.children = children;
+                }
+                return {namespace: "dash_bootstrap_components", type: type, props: props};
+            }
+
+            if (data.alert) {
+                return dbc("Alert", {color: data.alert.color, className: data.alert.className || ""},
+                           data.alert.message);
+            }
+
+            var detectors = {
+                PROMPT_INJECTION: ["Prompt Injection", "🔓"],
+                PII: ["PII Detection", "🔍"],
+                BANNED_TOPICS: ["Banned Topics", "🚫"],
+                SECRETS: ["Secrets", "🗝️"]
+            };
+            var detector = detectors[data.detector] || [data.detector, ""];
+            var result = data.result || {};
+
+            // Determine result styling
+            var isDetected = Boolean(result.is_detected);
+            var isAborted = Boolean(result.scan_aborted);
+            var threatLevel = result.threat_level || "LOW";
+            var confidence = result.confidence || 0.0;
+            var latency = result.latency || 0;
+
+            // An aborted scan is neither a pass nor a block
+            var status = isAborted
+                ? {color: "warning", icon: "fa-hourglass-end", title: "SCAN ABORTED", badge: "NOT SCANNED",
+                   message: "Your input was too expensive to scan in time, so no verdict was reached"}
+                : isDetected
+                ? {color: "danger", icon: "fa-exclamation-triangle", title: "ATTACK DETECTED!", badge: "BLOCKED",
+                   message: "Your attempt was blocked by our AI security system"}
+                : {color: "success", icon: "fa-check-circle", title: "ATTACK FAILED", badge: "PASSED",
+                   message: "No security issues detected in your input"};
+
+            var statusCard = dbc("Card", {
+                color: status.color,
+                outline: true,
+                className: "mb-4"
+            }, [
+                dbc("CardBody", {}, [
+                    html("Div", {className: "text-center"}, [
+                        html("I", {className: "fas " + status.icon + " fa-3x mb-3"}),
+                        html("H3", {className: "gaming-font"}, status.title),
+                        html("P", {className: "mb-0"}, status.message)
+                    ])
+                ])
+            ]);
+
+            var detailsCard = dbc("Card", {className: "mb-4"}, [
+                dbc("CardHeader", {}, [
+                    html("H5", {className: "mb-0 gaming-font"}, [detector[1], " " + detector[0] + " Results"])
+                ]),
+                dbc("CardBody", {}, [
+                    dbc("Row", {}, [
+                        dbc("Col", {width: 6, className: "mb-2"}, [
+                            html("Strong", {}, "🎯 Status: "),
+                            dbc("Badge", {color: status.color, className: "ms-2"}, status.badge)
+                        ]),
+                        dbc("Col", {width: 6, className: "mb-2"}, [
+                            html("Strong", {}, "⚡ Threat Level: "),
+                            html("Span", {className: "threat-level-" + threatLevel + " fw-bold"}, threatLevel)
+                        ]),
+                        dbc("Col", {width: 6, className: "mb-2"}, [
+                            html("Strong", {}, "🎲 Confidence: "),
+                            html("Span", {}, confidence > 0 ? confidence.toFixed(2) : "N/A")
+                        ]),
+                        dbc("Col", {width: 6, className: "mb-2"}, [
+                            html("Strong", {}, "⏱️ Response Time: "),
+                            html("Span", {}, latency.toFixed(3) + "s")
+                        ])
+                    ])
+                ])
+            ]);
+
+            // Technical details (JSON response)
+            var jsonCard = dbc("Card", {}, [
+                dbc("CardHeader", {}, [
+                    html("H6", {className: "mb-0 gaming-font"}, "🔧 Technical Details")
+                ]),
+                dbc("CardBody", {}, [
+                    html("Pre", {
+                        className: "technical-details",
+                        style: {
+                            "background": "rgba(0,0,0,0.3)",
+                            "color": "#00ff00",
+                            "font-family": "monospace",
+                            "font-size": "12px",
+                            "border-radius": "8px",
+                            "padding": "15px",
+                            "max-height": "300px",
+                            "overflow-y": "auto"
+                        }
+                    }, JSON.stringify(result, null, 2))
+                ])
+            ]);
+
+            return html("Div", {}, [statusCard, detailsCard, jsonCard]);
+        },
+
+        // Live mode: remember when the text last changed, and only tick the debounce timer while live
+        markTyping: function(value, live) {
+            return [{ts: Date.now()}, !live];
+        },
+
+        // Once typing has paused for the configured time, send the server only what changed since the
+        // last text it saw; the full text goes up on the first send or when the server asks to resync
+        debounceTyping: function(n, typing, lastSent, value, live, config, state) {
+            var noUpdate = window.dash_clientside.no_update;
+            if (!live || !typing || Date.now() - typing.ts < config.debounce_ms) {
+                return [noUpdate, noUpdate];
+            }
+            value = value || "";
+            var resync = Boolean(lastSent && state && state.resync && state.seq === lastSent.seq);
+            if (lastSent && value === lastSent.text && !resync) {
+                return [noUpdate, noUpdate];
+            }
+
+            var session = lastSent ? lastSent.session : Math.random().toString(36).slice(2) + Date.now().toString(36);
+            var seq = lastSent ? lastSent.seq + 1 : 1;
+            var sent = {session: session, seq: seq, text: value};
+            if (!lastSent || resync) {
+                return [sent, {session: session, seq: seq, base: null, text: value}];
+            }
+
+            // Offsets are Python code points, so diff by code point rather than UTF-16 unit
+            var oldChars = Array.from(lastSent.text);
+            var newChars = Array.from(value);
+            var limit = Math.min(oldChars.length, newChars.length);
+            var prefix = 0;
+            while (prefix < limit && oldChars[prefix] === newChars[prefix]) {
+                prefix += 1;
+            }
+            var suffix = 0;
+            while (suffix < limit - prefix &&
+                   oldChars[oldChars.length - 1 - suffix] === newChars[newChars.length - 1 - suffix]) {
+                suffix += 1;
+            }
+            return [sent, {
+                session: session,
+                seq: seq,
+                base: lastSent.seq,
+                start: prefix,
+                end: oldChars.length - suffix,
+                insert: newChars.slice(prefix, newChars.length - suffix).join("")
+            }];
+        },
+
+        // The server returns spans only; they apply to the text this browser sent with the same seq
+        renderHighlights: function(state, live, sent) {
+            if (!live || !state || !sent || !sent.text) {
+                return null;
+            }
+            if (state.seq !== sent.seq || state.resync) {
+                return window.dash_clientside.no_update;
+            }
+            if (state.aborted) {
+                return {namespace: "dash_html_components", type: "Small", props: {
+                    children: "⛔ Live scan aborted: input too expensive to scan, press Launch Attack for a full verdict",
+                    className: "text-warning"
+                }};
+            }
+
+            // Span offsets are Python code points, so slice by code point rather than UTF-16 unit
+            var chars = Array.from(sent.text);
+            var icons = {PII: "🔍", SECRETS: "🗝️"};
+            var colors = {PII: "rgba(23, 162, 184, 0.45)", SECRETS: "rgba(255, 165, 2, 0.45)"};
+
+            // Merge overlapping spans so each character is highlighted once
+            var merged = [];
+            state.spans.forEach(function(span) {
+                var last = merged[merged.length - 1];
+                if (last && span[0] < last.end) {
+                    last.end = Math.max(last.end, span[1]);
+                    last.types.push(span[3]);
+                } else {
+                    merged.push({start: span[0], end: span[1], detector: span[2], types: [span[3]]});
+                }
+            });
+
+            var children = [];
+            var cursor = 0;
+            merged.forEach(function(span) {
+                if (span.start > cursor) {
+                    children.push(chars.slice(cursor, span.start).join(""));
+                }
+                children.push({
+                    namespace: "dash_html_components",
+                    type: "Mark",
+                    props: {
+                        children: chars.slice(span.start, span.end).join(""),
+                        title: span.types.join(", "),
+                        style: {background: colors[span.detector], color: "inherit", padding: 0}
+                    }
+                });
+                cursor = span.end;
+            });
+            if (cursor < chars.length) {
+                children.push(chars.slice(cursor).join(""));
+            }
+
+            var counts = {PII: 0, SECRETS: 0};
+            state.spans.forEach(function(span) { counts[span[2]] += 1; });
+            var summary = icons.PII + " " + counts.PII + " PII · " + icons.SECRETS + " " + counts.SECRETS +
+                " secrets · scanned in " + (state.latency * 1000).toFixed(1) + "ms";
+
+            return {
+                namespace: "dash_html_components",
+                type: "Div",
+                props: {children: [
+                    {namespace: "dash_html_components", type: "Div", props: {
+                        children: children,
+                        className: "technical-details",
+                        style: {
+                            "white-space": "pre-wrap",
+                            "background": "rgba(0,0,0,0.3)",
+                            "border-radius": "8px",
+                            "padding": "10px",
+                            "max-height": "200px",
+                            "overflow-y": "auto"
+                        }
+                    }},
+                    {namespace: "dash_html_components", type: "Small", props: {
+                        children: summary,
+                        className: "text-white-50"
+                    }}
+                ]}
+            };
+        }
+    }
+});
@@ -0,0 +1,263 @@
+"""Similarity index of known attacks, used to skip the LLM for near-duplicates.
+
+Each index lives in its own directory:
+    meta.json      embedding model and vector dimension
+    vectors.f16    L2-normalised float16 rows, memory-mapped for search
+    labels.jsonl   one label record per row, in the same order
+
+    index.lock     taken exclusively around every append and repair
+
+Rows are only ever appended, so new confirmed detections are added without
+rewriting the matrix. Several processes may hold the same index (the server,
+`attack_index.py build`); the lock keeps one from repairing a file another is
+halfway through appending to.
+
+Build or extend an index from labelled examples:
+    python attack_index.py build known_attacks.jsonl --detector PROMPT_INJECTION
+where each line looks like {"text": "...", "label": "Direct Injection"}.
+"""
+import argparse
+import contextlib
+import fcntl
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import requests
+
+SEARCH_BLOCK_ROWS = 8192
+
+
+class AttackIndex:
+    def __init__(self, path, base_url, embed_model, read_only=False, keep_alive=None):
+        self.path = path
+        self.base_url = base_url
+        self.embed_model = embed_model
+        # Sent with every embed call so the embedding model stays resident like the chat model
+        self.keep_alive = keep_alive
+        self.read_only = read_only
+        self.dim = None
+        self.vectors = None
+        self.labels = []
+        self._lock = threading.Lock()
+        # Recent timings only; the server runs for a long time
+        self._search_times = deque(maxlen=1000)
+        self._embed_times = deque(maxlen=1000)
+        self.lookups = 0
+        self.hits = 0
+        self.added = 0
+        self.load()
+
+    @property
+    def vectors_path(self):
+        return os.path.join(self.path, "vectors.f16")
+
+    @property
+    def labels_path(self):
+        return os.path.join(self.path, "labels.jsonl")
+
+    @property
+    def meta_path(self):
+        return os.path.join(self.path, "meta.json")
+
+    @property
+    def lock_path(self):
+        return os.path.join(self.path, "index.lock")
+
+    @contextlib.contextmanager
+    def file_lock(self):
+        """Exclusive lock on the index files, shared by every process that writes them"""
+        os.makedirs(self.path, exist_ok=True)
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def load(self):
+        """(Re)map the vector file; a missing index just stays empty"""
+        if self.read_only:
+            self._load()
+            return
+        if not os.path.exists(self.meta_path):
+            return
+        # Repairs truncate the files, so never while another writer is mid-append
+        with self.file_lock():
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        if meta["model"] != self.embed_model:
+            print(f"⚠️ Attack index {self.path} was built with {meta['model']}, not {self.embed_model}; ignoring it")
+            return
+        # Byte offset just past each complete label line, so the file can be cut back to any row
+        labels, label_ends = [], []
+        if os.path.exists(self.labels_path):
+            with open(self.labels_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    try:
+                        label = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append
+                        break
+                    offset += len(line)
+                    labels.append(label)
+                    label_ends.append(offset)
+        row_bytes = meta["dim"] * 2
+        rows = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        # A crash between the two appends can leave one file a row ahead; trust the shorter one
+        count = min(rows, len(labels))
+        if not self.read_only:
+            # Cut both files back to count rows, or the next append would pair vectors with the wrong labels
+            if os.path.exists(self.vectors_path) and os.path.getsize(self.vectors_path) != count * row_bytes:
+                os.truncate(self.vectors_path, count * row_bytes)
+            label_bytes = label_ends[count - 1] if count else 0
+            if os.path.exists(self.labels_path) and os.path.getsize(self.labels_path) != label_bytes:
+                os.truncate(self.labels_path, label_bytes)
+        vectors = None
+        if count:
+            vectors = np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(count, meta["dim"]))
+        with self._lock:
+            self.dim = meta["dim"]
+            self.vectors = vectors
+            self.labels = labels[:count]
+
+    def embed(self, texts):
+        """Embed texts with Ollama and L2-normalise them; returns None if the call fails"""
+        start_time = time.time()
+        payload = {"model": self.embed_model, "input": texts}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        try:
+            response = requests.post(
+                f"{self.base_url}/api/embed",
+                json=payload,
+                timeout=30
+            )
+        except Exception as e:
+            print(f"💥 Embedding failed: {e}")
+            return None
+        if response.status_code != 200:
+            print(f"❌ Embedding error: {response.status_code} - {response.text}")
+            return None
+        vectors = np.asarray(response.json()["embeddings"], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1.0, norms)
+        self._embed_times.append(time.time() - start_time)
+        return vectors
+
+    def search(self, vector, k=5):
+        """Top-k cosine matches for one normalised vector, best first"""
+        with self._lock:
+            vectors, labels = self.vectors, self.labels
+        if vectors is None:
+            return []
+        start_time = time.time()
+        # numpy has no BLAS path for float16, so upcast block by block instead of all at once
+        scores = np.empty(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), SEARCH_BLOCK_ROWS):
+            block = vectors[start:start + SEARCH_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ vector
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        self._search_times.append(time.time() - start_time)
+        return [(float(scores[i]), labels[i]) for i in top]
+
+    def lookup(self, text, threshold, k=5):
+        """Return (best_match, query_vector); best_match is None below the threshold"""
+        # Embed even when the index is empty, so the caller can add a confirmed detection
+        vectors = self.embed([text])
+        if vectors is None:
+            return None, None
+        matches = self.search(vectors[0], k)
+        self.lookups += 1
+        if matches and matches[0][0] >= threshold:
+            self.hits += 1
+            return matches[0], vectors[0]
+        return None, vectors[0]
+
+    def add(self, vectors, labels):
+        """Append normalised vectors and their labels to the index files"""
+        if self.read_only:
+            return
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        with self.file_lock():
+            with self._lock:
+                if self.dim is None:
+                    self.dim = vectors.shape[1]
+                    with open(self.meta_path, "w") as f:
+                        json.dump({"model": self.embed_model, "dim": self.dim}, f)
+                elif vectors.shape[1] != self.dim:
+                    raise ValueError(f"Expected {self.dim}-dim vectors, got {vectors.shape[1]}")
+                with open(self.vectors_path, "ab") as f:
+                    f.write(vectors.astype(np.float16).tobytes())
+                with open(self.labels_path, "a") as f:
+                    for label in labels:
+                        f.write(json.dumps(label) + "\n")
+                count = len(self.labels) + len(labels)
+                self.added += len(labels)
+                known = os.path.getsize(self.vectors_path) == count * self.dim * 2
+                if known:
+                    self.vectors = np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(count, self.dim))
+                    self.labels = self.labels + list(labels)
+            if not known:
+                # Another process appended since we loaded; re-read so rows and labels line up
+                self._load()
+
+    def stats(self):
+        search_times = sorted(self._search_times)
+        embed_times = list(self._embed_times)
+        return {
+            "size": len(self),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "added": self.added,
+            "avg_search_ms": 1000 * sum(search_times) / len(search_times) if search_times else None,
+            "p95_search_ms": 1000 * search_times[int(0.95 * (len(search_times) - 1))] if search_times else None,
+            "avg_embed_ms": 1000 * sum(embed_times) / len(embed_times) if embed_times else None
+        }
+
+
+def main(argv=None):
+    from dash_app import ATTACK_INDEX_DIR, OLLAMA_BASE_URL, OLLAMA_EMBED_MODEL, OLLAMA_KEEP_ALIVE
+
+    parser = argparse.ArgumentParser(description="Build or extend a known-attack similarity index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="embed labelled examples into an index")
+    build.add_argument("examples", help='JSONL file of {"text": ..., "label": ...} records')
+    build.add_argument("--detector", required=True, choices=["PROMPT_INJECTION", "BANNED_TOPICS"])
+    build.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    index = AttackIndex(os.path.join(ATTACK_INDEX_DIR, args.detector.lower()), OLLAMA_BASE_URL, OLLAMA_EMBED_MODEL,
+                        keep_alive=OLLAMA_KEEP_ALIVE)
+    with open(args.examples) as f:
+        examples = [json.loads(line) for line in f if line.strip()]
+    for i in range(0, len(examples), args.batch_size):
+        batch = examples[i:i + args.batch_size]
+        vectors = index.embed([example["text"] for example in batch])
+        if vectors is None:
+            return 1
+        index.add(vectors, [{"label": example.get("label", "Known Attack"), "text": example["text"][:200]}
+                            for example in batch])
+        print(f"📥 Indexed {min(i + args.batch_size, len(examples))}/{len(examples)}")
+    print(f"✅ {index.path} now holds {len(index)} known attacks")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
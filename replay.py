@@ -0,0 +1,285 @@
+"""Offline replay: re-score logged traffic with the current detectors.
+
+Reads a JSONL corpus, fans the records out across a process pool (one
+ContentAnalyzer per worker) and writes the new verdicts to an output JSONL
+file. All workers share one Ollama, so at most --llm-concurrency of them run
+an LLM detector at a time; results where the LLM call failed count as
+errors, not verdicts. The output file doubles as the checkpoint, so an interrupted run picks
+up where it stopped when started again with the same arguments. Each row
+records the rule pack version it was scored with, and a resume with a
+different pack is refused rather than mixing verdicts from two packs.
+
+Usage:
+    python replay.py traffic.jsonl -o rescored.jsonl --report diff.json [--rules rules/candidate.json]
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from multiprocessing import BoundedSemaphore, Pool
+
+from dash_app import ContentAnalyzer, DETECTOR_METHODS, LLM_DETECTORS, RULE_PACK_PATH
+from rule_packs import RulePackError, load_rule_pack
+
+_analyzer = None
+_llm_slots = None
+
+
+def init_worker(rule_pack_path, llm_slots):
+    global _analyzer, _llm_slots
+    # Let the parent handle Ctrl-C so the checkpoint is closed cleanly
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Workers only read the known-attack index; concurrent appends would corrupt it
+    _analyzer = ContentAnalyzer(learn_attacks=False, rule_pack_path=rule_pack_path)
+    _llm_slots = llm_slots
+
+
+def score_record(task):
+    """Run one detector over one record inside a worker process"""
+    line_no, record_id, detector, text, stored = task
+    try:
+        if detector in LLM_DETECTORS:
+            with _llm_slots:
+                result = getattr(_analyzer, DETECTOR_METHODS[detector])(text)
+        else:
+            result = getattr(_analyzer, DETECTOR_METHODS[detector])(text)
+    except Exception as e:
+        result = {"error": str(e)}
+    return {
+        "line": line_no,
+        "id": record_id,
+        "detector": detector,
+        "result": result,
+        "stored": stored,
+        "rule_pack_version": _analyzer.rules.version
+    }
+
+
+def verdict(result):
+    """Reduce a stored or fresh result to the fields we diff on"""
+    if not isinstance(result, dict):
+        return None
+    return {
+        "is_detected": bool(result.get("is_detected", False)),
+        "threat_level": result.get("threat_level", "UNKNOWN"),
+        "scan_aborted": bool(result.get("scan_aborted", False))
+    }
+
+
+def stored_result(record, field, detector):
+    """Stored results are either one result dict or a dict keyed by detector"""
+    stored = record.get(field)
+    if not isinstance(stored, dict):
+        return None
+    if detector in stored and isinstance(stored[detector], dict):
+        return stored[detector]
+    if "is_detected" in stored:
+        stored_detector = record.get("detector")
+        if stored_detector is None or stored_detector == detector:
+            return stored
+    return None
+
+
+def load_checkpoint(path):
+    """Return the (line, detector) pairs already written to the output file, and their rule pack versions"""
+    done = set()
+    versions = set()
+    if not os.path.exists(path):
+        return done, versions
+    good_bytes = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted run; it gets redone
+                break
+            done.add((row["line"], row["detector"]))
+            versions.add(row.get("rule_pack_version"))
+            good_bytes += len(line)
+    # Drop the torn tail so appended results start on a fresh line
+    if good_bytes < os.path.getsize(path):
+        os.truncate(path, good_bytes)
+    return done, versions
+
+
+def iter_tasks(args, done):
+    with open(args.corpus) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ Skipping malformed line {line_no}", file=sys.stderr)
+                continue
+            text = record.get(args.text_field)
+            if not text:
+                continue
+            record_id = record.get(args.id_field, line_no)
+            if record.get(args.detector_field) in DETECTOR_METHODS:
+                detectors = [record[args.detector_field]]
+            else:
+                detectors = args.detectors
+            for detector in detectors:
+                if (line_no, detector) in done:
+                    continue
+                stored = verdict(stored_result(record, args.result_field, detector))
+                yield (line_no, record_id, detector, text, stored)
+
+
+def build_report(path):
+    """Diff fresh verdicts against stored ones across the whole output file"""
+    report = {
+        "scored": 0,
+        "compared": 0,
+        "unchanged": 0,
+        "newly_detected": [],
+        "no_longer_detected": [],
+        "threat_level_changed": [],
+        "errors": 0,
+        "aborted": [],
+        "by_detector": {},
+        "tokens": {},
+        "rule_pack_versions": []
+    }
+    with open(path) as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            report["scored"] += 1
+            stats = report["by_detector"].setdefault(
+                row["detector"], {"scored": 0, "detected": 0, "aborted": 0, "flipped": 0}
+            )
+            stats["scored"] += 1
+            # A failed LLM call falls back to a placeholder "not detected"; that is no verdict
+            if "error" in row["result"] or row["result"].get("llm_failed"):
+                report["errors"] += 1
+                continue
+            usage = row["result"].get("usage")
+            if usage:
+                tokens = report["tokens"].setdefault(
+                    row["detector"], {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "budget_hits": 0}
+                )
+                tokens["calls"] += 1
+                tokens["prompt_tokens"] += usage["prompt_tokens"]
+                tokens["completion_tokens"] += usage["completion_tokens"]
+                tokens["budget_hits"] += int(usage["hit_budget"])
+            version = row["result"].get("rule_pack_version")
+            if version and version not in report["rule_pack_versions"]:
+                report["rule_pack_versions"].append(version)
+            new = verdict(row["result"])
+            old = row.get("stored")
+            if new["scan_aborted"]:
+                # No verdict to diff; list them so the inputs can be checked by hand
+                report["aborted"].append({"id": row["id"], "detector": row["detector"], "old": old})
+                stats["aborted"] += 1
+                continue
+            stats["detected"] += int(new["is_detected"])
+            if old is None or old["scan_aborted"]:
+                continue
+            report["compared"] += 1
+            entry = {"id": row["id"], "detector": row["detector"], "old": old, "new": new}
+            if new["is_detected"] and not old["is_detected"]:
+                report["newly_detected"].append(entry)
+                stats["flipped"] += 1
+            elif old["is_detected"] and not new["is_detected"]:
+                report["no_longer_detected"].append(entry)
+                stats["flipped"] += 1
+            elif new["threat_level"] != old["threat_level"]:
+                report["threat_level_changed"].append(entry)
+            else:
+                report["unchanged"] += 1
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score logged traffic with the current detectors")
+    parser.add_argument("corpus", help="JSONL file of logged requests")
+    parser.add_argument("-o", "--output", default="rescored.jsonl",
+                        help="JSONL file for fresh results; also used as the resume checkpoint")
+    parser.add_argument("--report", help="write the verdict-diff report to this JSON file")
+    parser.add_argument("--detectors", nargs="+", default=list(DETECTOR_METHODS),
+                        choices=list(DETECTOR_METHODS),
+                        help="detectors to run on records that do not name one")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--detector-field", default="detector")
+    parser.add_argument("--result-field", default="result")
+    parser.add_argument("--rules", default=RULE_PACK_PATH,
+                        help="rule pack to score with, e.g. a candidate pack before deploying it")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--llm-concurrency", type=int, default=2,
+                        help="max workers calling Ollama at once; the rest keep running the regex detectors")
+    parser.add_argument("--chunksize", type=int, default=8)
+    parser.add_argument("--fresh", action="store_true",
+                        help="ignore an existing output file instead of resuming from it")
+    args = parser.parse_args(argv)
+
+    try:
+        rule_pack_version = load_rule_pack(args.rules).version
+    except RulePackError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    if args.fresh and os.path.exists(args.output):
+        os.remove(args.output)
+    done, versions = load_checkpoint(args.output)
+    if versions - {rule_pack_version}:
+        found = ", ".join(sorted(str(version) for version in versions))
+        print(f"❌ {args.output} was scored with rule pack {found}, not {rule_pack_version}; "
+              f"rerun with --fresh or a different --output", file=sys.stderr)
+        return 2
+    if done:
+        print(f"♻️ Resuming: {len(done)} results already in {args.output}")
+
+    scored = 0
+    start_time = time.time()
+    llm_slots = BoundedSemaphore(args.llm_concurrency)
+    with open(args.output, "a") as out, Pool(args.workers, initializer=init_worker, initargs=(args.rules, llm_slots)) as pool:
+        try:
+            for row in pool.imap_unordered(score_record, iter_tasks(args, done), chunksize=args.chunksize):
+                out.write(json.dumps(row) + "\n")
+                scored += 1
+                if scored % 100 == 0:
+                    out.flush()
+                    elapsed = time.time() - start_time
+                    print(f"📈 {scored} scored, {scored / elapsed:.1f} records/s")
+        except KeyboardInterrupt:
+            print("⏸️ Interrupted, progress saved; rerun the same command to resume")
+            pool.terminate()
+            return 130
+
+    elapsed = time.time() - start_time
+    rate = scored / elapsed if elapsed > 0 else 0.0
+    print(f"✅ Scored {scored} records in {elapsed:.1f}s ({rate:.1f} records/s, {args.workers} workers)")
+
+    report = build_report(args.output)
+    report["throughput"] = {"records": scored, "seconds": elapsed, "records_per_second": rate}
+    print(f"🔍 Compared {report['compared']} stored verdicts: "
+          f"{len(report['newly_detected'])} newly detected, "
+          f"{len(report['no_longer_detected'])} no longer detected, "
+          f"{len(report['threat_level_changed'])} threat level changes, "
+          f"{len(report['aborted'])} scans aborted, "
+          f"{report['errors']} errors")
+    for detector, stats in report["by_detector"].items():
+        print(f"   {detector}: {stats['scored']} scored, {stats['detected']} detected, "
+              f"{stats['aborted']} aborted, {stats['flipped']} flipped")
+    for detector, tokens in report["tokens"].items():
+        print(f"   🪙 {detector}: {tokens['calls']} LLM calls, "
+              f"{tokens['prompt_tokens'] / tokens['calls']:.0f} prompt + "
+              f"{tokens['completion_tokens'] / tokens['calls']:.0f} completion tokens/call, "
+              f"{tokens['budget_hits']} hit the token budget")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
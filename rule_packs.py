@@ -0,0 +1,153 @@
+"""Versioned detection rule packs, loaded from JSON files.
+
+A rule pack holds the injection, PII and secrets patterns and the LLM system
+prompts. load_rule_pack() validates and compiles a pack up front, so a pack
+either loads completely or raises RulePackError and the caller keeps the pack
+it already has. Compiled packs are never modified after loading, so swapping
+one in is a single reference assignment.
+
+A pack's version is its declared "version" plus a short hash of its content
+(e.g. "2026.10.18-1+3f9c2a1b"), so a pack edited without bumping the declared
+version still gets a new version and never passes for the rules it replaced.
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+from safe_regex import SafePattern
+
+REQUIRED_SYSTEM_PROMPTS = ("PROMPT_INJECTION", "BANNED_TOPICS")
+
+
+class RulePackError(Exception):
+    """Raised when a rule pack file is missing, malformed or does not compile"""
+
+
+class RulePack:
+    def __init__(self, path, data):
+        self.path = path
+        self.release = data["version"]
+        # Key order and formatting don't change the rules, so hash a canonical dump
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        self.digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:8]
+        self.version = f"{self.release}+{self.digest}"
+        self.description = data.get("description", "")
+        self.loaded_at = datetime.now().isoformat()
+        self.injection_patterns = [
+            _compile(config, ignore_case=True, where=f"injection_patterns[{i}]")
+            for i, config in enumerate(data["injection_patterns"])
+        ]
+        # name -> (compiled pattern, risk)
+        self.pii_patterns = {
+            pii_type: (_compile(config, ignore_case=False, where=f"pii_patterns.{pii_type}"), config["risk"])
+            for pii_type, config in data["pii_patterns"].items()
+        }
+        self.secret_patterns = {
+            secret_type: (_compile(config, ignore_case=True, where=f"secret_patterns.{secret_type}"), config["risk"])
+            for secret_type, config in data["secret_patterns"].items()
+        }
+        self.system_prompts = dict(data["system_prompts"])
+        # (detector, type, compiled pattern, risk) for the live-mode scanners
+        self.live_patterns = [
+            ("PII", pii_type, pattern, risk) for pii_type, (pattern, risk) in self.pii_patterns.items()
+        ] + [
+            ("SECRETS", secret_type, pattern, risk) for secret_type, (pattern, risk) in self.secret_patterns.items()
+        ]
+
+    def summary(self):
+        return {
+            "version": self.version,
+            "release": self.release,
+            "description": self.description,
+            "path": self.path,
+            "loaded_at": self.loaded_at,
+            "injection_patterns": len(self.injection_patterns),
+            "pii_patterns": len(self.pii_patterns),
+            "secret_patterns": len(self.secret_patterns)
+        }
+
+
+def _compile(config, ignore_case, where):
+    try:
+        return SafePattern(config["pattern"], ignore_case=ignore_case, unsafe=config.get("unsafe", False))
+    except Exception as e:
+        raise RulePackError(f"{where}: pattern does not compile: {e}")
+
+
+def _validate(data):
+    if not isinstance(data, dict):
+        raise RulePackError("Rule pack must be a JSON object")
+    if not isinstance(data.get("version"), str) or not data["version"]:
+        raise RulePackError("'version' must be a non-empty string")
+    if not isinstance(data.get("injection_patterns"), list):
+        raise RulePackError("'injection_patterns' must be a list")
+    for i, config in enumerate(data["injection_patterns"]):
+        if not isinstance(config, dict) or not isinstance(config.get("pattern"), str):
+            raise RulePackError(f"injection_patterns[{i}] needs a 'pattern' string")
+    for section in ("pii_patterns", "secret_patterns"):
+        if not isinstance(data.get(section), dict):
+            raise RulePackError(f"'{section}' must be an object")
+        for name, config in data[section].items():
+            if not isinstance(config, dict) or not isinstance(config.get("pattern"), str):
+                raise RulePackError(f"{section}.{name} needs a 'pattern' string")
+            risk = config.get("risk")
+            if isinstance(risk, bool) or not isinstance(risk, (int, float)) or not 0.0 <= risk <= 1.0:
+                raise RulePackError(f"{section}.{name}: 'risk' must be a number between 0 and 1")
+    prompts = data.get("system_prompts")
+    if not isinstance(prompts, dict):
+        raise RulePackError("'system_prompts' must be an object")
+    for detector in REQUIRED_SYSTEM_PROMPTS:
+        if not isinstance(prompts.get(detector), str) or not prompts[detector].strip():
+            raise RulePackError(f"system_prompts.{detector} must be a non-empty string")
+
+
+def load_rule_pack(path):
+    """Read, validate and compile a rule pack; raises RulePackError on any problem"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise RulePackError(f"Could not read {path}: {e}")
+    _validate(data)
+    return RulePack(path, data)
+
+
+class RulePackWatcher:
+    """Polls a rule pack file and hands each new, successfully compiled pack to on_load"""
+
+    def __init__(self, path, on_load, interval=5):
+        self.path = path
+        self.on_load = on_load
+        self.interval = interval
+        self.last_error = None
+        self._mtime = self._current_mtime()
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def check(self):
+        """Reload if the file changed; returns the new pack, or None if unchanged or invalid"""
+        mtime = self._current_mtime()
+        if mtime is None or mtime == self._mtime:
+            return None
+        self._mtime = mtime
+        try:
+            pack = load_rule_pack(self.path)
+        except RulePackError as e:
+            # Keep serving with the pack we already have
+            self.last_error = {"at": datetime.now().isoformat(), "error": str(e)}
+            print(f"❌ Rule pack {self.path} rejected, keeping the current one: {e}")
+            return None
+        self.last_error = None
+        self.on_load(pack)
+        return pack
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            self.check()
@@ -0,0 +1,82 @@
+"""Detector regexes that cannot pin a worker on hostile input.
+
+Every scan gets a ScanBudget (a wall-clock deadline shared by all the
+patterns in one detector run). Patterns run on the `regex` module, which
+can give up after a timeout; patterns flagged unsafe run on RE2 instead,
+which matches in linear time and so cannot backtrack, but also cannot be
+interrupted once started; a budget's max_chars caps how much text any one
+scan may cover, which bounds how far an RE2 call can overrun. google-re2 is required
+for unsafe patterns, so a pattern never silently changes engine. Note that in
+RE2 \b, \d, \s and \w are ASCII-only, unlike in `regex`. When the budget
+runs out, ScanAborted is raised and the caller returns a "scan aborted" verdict.
+"""
+import time
+
+import regex
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+class ScanAborted(Exception):
+    """Raised when a scan runs out of its time budget"""
+
+
+class ScanBudget:
+    def __init__(self, seconds, max_chars=None):
+        self.seconds = seconds
+        self.max_chars = max_chars
+        self.deadline = time.monotonic() + seconds
+
+    def check_length(self, length):
+        if self.max_chars is not None and length > self.max_chars:
+            raise ScanAborted(f"Input of {length} characters exceeds the {self.max_chars} character scan limit")
+
+    def remaining(self):
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise ScanAborted(f"Scan exceeded its {self.seconds:.3f}s budget")
+        return remaining
+
+
+class SafePattern:
+    def __init__(self, pattern, ignore_case=False, unsafe=False):
+        self.pattern = pattern
+        self.ignore_case = ignore_case
+        self.unsafe = unsafe
+        if unsafe:
+            if re2 is None:
+                raise ImportError("google-re2 is required for patterns marked unsafe")
+            self.engine = "re2"
+            self._compiled = re2.compile(("(?i)" if ignore_case else "") + pattern)
+        else:
+            self.engine = "regex"
+            self._compiled = regex.compile(pattern, regex.IGNORECASE if ignore_case else 0)
+
+    def _run(self, budget, call, length):
+        budget.check_length(length)
+        if self.engine == "re2":
+            # Linear time, so there is nothing to interrupt; just refuse to start once the budget is gone
+            budget.remaining()
+            return call()
+        try:
+            return call(timeout=budget.remaining())
+        except TimeoutError:
+            raise ScanAborted(f"Pattern {self.pattern!r} exceeded the scan budget")
+
+    def finditer(self, text, budget, pos=0, endpos=None):
+        """All matches in text[pos:endpos], as a list so the whole scan happens under the budget"""
+        endpos = len(text) if endpos is None else endpos
+        return self._run(budget, lambda **timeout: list(self._compiled.finditer(text, pos, endpos, **timeout)),
+                         endpos - pos)
+
+    def search(self, text, budget):
+        return self._run(budget, lambda **timeout: self._compiled.search(text, **timeout), len(text))
+
+    def sub(self, repl, text, budget):
+        """Replace every match with repl, taken literally (no group references)"""
+        # A callable sidesteps template parsing; google-re2 mangles non-ASCII templates
+        return self._run(budget, lambda **timeout: self._compiled.sub(lambda match: repl, text, **timeout),
+                         len(text))